@@ -7,9 +7,17 @@ setup(
     package_dir={"": "src"},
     install_requires=[
         "requests>=2.31.0",
+        "orjson>=3.8.0",
         "pandas>=2.1.0",
+        "pyarrow>=14.0.0",
+        "ijson>=3.1.0",
         "nhlpy>=0.3.0",
     ],
+    extras_require={
+        "async": ["httpx[http2]>=0.25.0"],
+        "cache": ["requests-cache>=1.0.0"],
+        "compile": ["treelite>=4.0", "tl2cgen>=1.0"],
+    },
     author="James Calleja",
     author_email="james.calleja@gmail.com",
     description="NHL Machine Learning Tools",
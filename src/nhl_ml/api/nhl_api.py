@@ -2,11 +2,16 @@
 NHL API interaction module.
 """
 
-import requests
-import json
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from typing import Dict, Optional, List
 
+import orjson
+
+from .session import REQUEST_TIMEOUT, APIClient, get_json
+
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -17,11 +22,24 @@ logger = logging.getLogger(__name__)
 NHL_API_BASE = "https://api-web.nhle.com/v1"
 
 
-class NHLStats:
-    def __init__(self):
-        self.headers = {
-            'Accept': 'application/json'
-        }
+def _roster_players(roster_data: Dict) -> List[Dict]:
+    """Flatten a roster response into a single list of players."""
+    player_types = ('forwards', 'defensemen', 'goalies')
+    return list(chain.from_iterable(
+        roster_data.get(player_type, ()) for player_type in player_types
+    ))
+
+
+class NHLStats(APIClient):
+    def __init__(
+        self, max_workers: int = 16, cache_name: Optional[str] = None
+    ):
+        super().__init__(
+            {'Accept': 'application/json'},
+            pool_maxsize=max(32, max_workers),
+            cache_name=cache_name
+        )
+        self.max_workers = max_workers
         self.teams = {
             "TOR": {"id": 10, "name": "Toronto Maple Leafs"},
             "FLA": {"id": 13, "name": "Florida Panthers"}
@@ -33,15 +51,8 @@ class NHLStats:
 
         try:
             logger.info(f"Fetching roster for {team_abbrev}")
-            response = requests.get(roster_url, headers=self.headers)
-            response.raise_for_status()
-            roster_data = response.json()
-
-            all_players = []
-            player_types = ['forwards', 'defensemen', 'goalies']
-            for player_type in player_types:
-                if player_type in roster_data:
-                    all_players.extend(roster_data[player_type])
+            roster_data = self._get_cached_json(roster_url)
+            all_players = _roster_players(roster_data)
 
             msg = f"Found {len(all_players)} players on {team_abbrev} roster"
             logger.info(msg)
@@ -57,16 +68,14 @@ class NHLStats:
         stats_url = f"{NHL_API_BASE}/player/{player_id}/landing"
 
         try:
-            logger.info(f"Fetching stats for player ID {player_id}")
-            response = requests.get(stats_url, headers=self.headers)
-            response.raise_for_status()
-            stats_data = response.json()
+            logger.debug("Fetching stats for player ID %s", player_id)
+            stats_data = get_json(self.session, stats_url)
 
             if stats_data:
-                first_name = stats_data.get('firstName', {}).get('default', '')
-                last_name = stats_data.get('lastName', {}).get('default', '')
-                name = f"{first_name} {last_name}".strip()
-                logger.info(f"Found stats for {name}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    first = stats_data.get('firstName', {}).get('default', '')
+                    last = stats_data.get('lastName', {}).get('default', '')
+                    logger.debug("Found stats for %s %s", first, last)
                 return stats_data
 
             return None
@@ -87,11 +96,10 @@ class NHLStats:
             roster = self.get_team_roster(team_abbrev)
             team_stats = []
 
-            # Get stats for each player
-            for player in roster:
-                player_id = player.get('id')
-                if player_id:
-                    stats = self.get_player_stats(player_id)
+            # Get stats for each player concurrently
+            player_ids = [p['id'] for p in roster if p.get('id')]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as ex:
+                for stats in ex.map(self.get_player_stats, player_ids):
                     if stats:
                         team_stats.append(stats)
 
@@ -101,19 +109,86 @@ class NHLStats:
 
         return all_stats
 
+    async def get_all_team_stats_async(self) -> Dict[str, List[Dict]]:
+        """Get stats for all players on both teams using asyncio.
+
+        Requests are multiplexed over a single HTTP/2 connection when the
+        server supports it. Requires the optional ``httpx[http2]`` dependency.
+        """
+        import httpx
+
+        limits = httpx.Limits(max_connections=self.max_workers)
+        async with httpx.AsyncClient(
+            http2=True,
+            headers=self.headers,
+            limits=limits,
+            timeout=REQUEST_TIMEOUT
+        ) as client:
+            results = await asyncio.gather(*(
+                self._fetch_team_stats_async(client, team_abbrev)
+                for team_abbrev in self.teams
+            ))
+
+        return dict(zip(self.teams, results))
+
+    async def _fetch_team_stats_async(
+        self, client, team_abbrev: str
+    ) -> List[Dict]:
+        """Fetch a team roster and then every player's stats."""
+        roster_url = f"{NHL_API_BASE}/roster/{team_abbrev}/current"
+
+        try:
+            logger.info(f"Fetching roster for {team_abbrev}")
+            response = await client.get(roster_url)
+            response.raise_for_status()
+            roster = _roster_players(response.json())
+        except Exception as e:
+            msg = f"Error fetching roster for {team_abbrev}: {e}"
+            logger.error(msg)
+            return []
+
+        player_ids = [p['id'] for p in roster if p.get('id')]
+        results = await asyncio.gather(*(
+            self._fetch_player_stats_async(client, player_id)
+            for player_id in player_ids
+        ))
+        team_stats = [stats for stats in results if stats]
+
+        msg = f"Processed {len(team_stats)} players for {team_abbrev}"
+        logger.info(msg)
+        return team_stats
+
+    async def _fetch_player_stats_async(
+        self, client, player_id: int
+    ) -> Optional[Dict]:
+        """Fetch detailed stats for a player with an async client."""
+        stats_url = f"{NHL_API_BASE}/player/{player_id}/landing"
+
+        try:
+            response = await client.get(stats_url)
+            response.raise_for_status()
+            return response.json() or None
+
+        except Exception as e:
+            msg = f"Error fetching stats for player ID {player_id}: {e}"
+            logger.error(msg)
+            return None
+
     def save_team_stats(self, output_file: str = "output.json") -> None:
         """Fetch and save all team stats to a file."""
         all_stats = self.get_all_team_stats()
 
-        # Save to file
+        # Save to file. orjson writes UTF-8 names unescaped and its own
+        # float formatting, so this is equivalent JSON to json.dumps but
+        # not byte-identical
         logger.info(f"\nSaving stats to {output_file}")
-        with open(output_file, 'w') as f:
-            f.write(json.dumps(all_stats, indent=2))
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(all_stats, option=orjson.OPT_INDENT_2))
         logger.info("Stats saved successfully")
 
 
 # Test section - only runs when this file is run directly
 if __name__ == "__main__":
     # Test the NHL Stats client
-    nhl = NHLStats()
-    nhl.save_team_stats()
+    with NHLStats(cache_name="nhl_cache") as nhl:
+        nhl.save_team_stats()
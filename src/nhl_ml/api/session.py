@@ -0,0 +1,114 @@
+"""
+HTTP session helpers shared by the NHL API clients.
+"""
+
+import logging
+import requests
+from datetime import timedelta
+from functools import lru_cache, partial
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait on the NHL API before giving up on a request
+REQUEST_TIMEOUT = 10
+
+# How long cached API responses are reused before being fetched again
+CACHE_EXPIRE_AFTER = timedelta(hours=6)
+
+
+def create_session(
+    headers: Dict[str, str],
+    pool_maxsize: int = 32,
+    cache_name: Optional[str] = None
+) -> requests.Session:
+    """Create a pooled session with retries for the NHL API.
+
+    Args:
+        headers (Dict[str, str]): Headers sent with every request
+        pool_maxsize (int): Connections kept open per host; should be at
+            least the number of threads sharing the session
+        cache_name (Optional[str]): Path of an SQLite response cache.
+            Expired entries are revalidated with If-None-Match and
+            If-Modified-Since, so unchanged resources come back as a 304
+            without a body. Uses the optional ``requests-cache``
+            dependency and falls back to an uncached session without it.
+    """
+    requests_cache = None
+    if cache_name:
+        try:
+            import requests_cache
+        except ImportError:
+            logger.warning(
+                "requests-cache is not installed; responses won't be cached"
+            )
+
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            cache_name,
+            backend='sqlite',
+            expire_after=CACHE_EXPIRE_AFTER,
+            allowable_codes=(200,),
+            cache_control=True,
+            stale_if_error=True
+        )
+    else:
+        session = requests.Session()
+    session.headers.update(headers)
+
+    retries = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=pool_maxsize,
+        max_retries=retries
+    )
+    session.mount('https://', adapter)
+
+    return session
+
+
+def get_json(session: requests.Session, url: str) -> Any:
+    """Fetch a URL with the session and decode the JSON body."""
+    response = session.get(url, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    if getattr(response, 'revalidated', False):
+        logger.debug(f"Not modified (304), reusing cached {url}")
+    elif getattr(response, 'from_cache', False):
+        logger.debug(f"Using cached response for {url}")
+    return response.json()
+
+
+class APIClient:
+    """Base for NHL API clients that share a pooled session."""
+
+    def __init__(
+        self,
+        headers: Dict[str, str],
+        pool_maxsize: int = 32,
+        cache_name: Optional[str] = None
+    ):
+        self.headers = headers
+        self.session = create_session(
+            headers, pool_maxsize=pool_maxsize, cache_name=cache_name
+        )
+        # Decoded responses for endpoints that don't change within a run
+        self._get_cached_json = lru_cache(maxsize=64)(
+            partial(get_json, self.session)
+        )
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections."""
+        self.session.close()
+
+    def __enter__(self) -> 'APIClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -2,30 +2,29 @@
 Module for retrieving and processing team-level NHL statistics.
 """
 
-import requests
 import json
 import logging
 from typing import Dict, List, Optional
 
+from .session import APIClient, get_json
+
 
 logger = logging.getLogger(__name__)
 
 
-class TeamStats:
+class TeamStats(APIClient):
     def __init__(self, team_id: int):
         """Initialize with team ID."""
+        super().__init__({'Accept': 'application/json'})
         self.team_id = team_id
         self.base_url = "https://api-web.nhle.com/v1"
-        self.headers = {'Accept': 'application/json'}
 
     def get_team_info(self) -> Optional[Dict]:
         """Fetch basic team information."""
         url = f"{self.base_url}/club-stats/team/{self.team_id}/now"
 
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            return self._get_cached_json(url)
 
         except Exception as e:
             logger.error(f"Error fetching team info: {e}")
@@ -37,9 +36,7 @@ class TeamStats:
                f"{self.team_id}/{season}")
 
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            data = get_json(self.session, url)
 
             return data.get('games', [])
 
@@ -70,5 +67,5 @@ class TeamStats:
 # Example usage
 if __name__ == "__main__":
     # Toronto Maple Leafs (ID: 10)
-    leafs = TeamStats(10)
-    print(json.dumps(leafs.get_team_stats(), indent=2))
+    with TeamStats(10) as leafs:
+        print(json.dumps(leafs.get_team_stats(), indent=2))
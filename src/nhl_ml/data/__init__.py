@@ -1,3 +1,7 @@
 """
 Data processing module for NHL stats.
 """
+
+from .data_processor import NHLDataProcessor
+
+__all__ = ['NHLDataProcessor']
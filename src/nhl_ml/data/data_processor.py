@@ -2,7 +2,8 @@
 NHL data processing module for converting raw API data into ML-ready format.
 """
 
-import json
+import ijson
+import numpy as np
 import pandas as pd
 import logging
 from pathlib import Path
@@ -13,6 +14,71 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Season that player ages are computed for
+SEASON_YEAR = 2024
+
+# Flattened API field prefixes for season and career totals
+SEASON_PREFIX = 'featuredStats_regularSeason_subSeason_'
+CAREER_PREFIX = 'careerTotals_regularSeason_'
+
+# API stat fields and the feature names they map to
+SEASON_STATS = {
+    'gamesPlayed': 'games_played',
+    'goals': 'goals',
+    'assists': 'assists',
+    'points': 'points',
+    'plusMinus': 'plus_minus',
+    'pim': 'pim',
+    'shots': 'shots',
+    'shootingPctg': 'shooting_pct',
+    'powerPlayGoals': 'powerplay_goals',
+    'powerPlayPoints': 'powerplay_points'
+}
+CAREER_STATS = {
+    'gamesPlayed': 'career_games',
+    'goals': 'career_goals',
+    'assists': 'career_assists',
+    'points': 'career_points',
+    'plusMinus': 'career_plus_minus',
+    'pim': 'career_pim',
+    'shots': 'career_shots',
+    'shootingPctg': 'career_shooting_pct',
+    'powerPlayGoals': 'career_powerplay_goals',
+    'powerPlayPoints': 'career_powerplay_points'
+}
+
+# Dtypes of the numeric columns in the processed dataset
+PLAYER_DTYPES = {
+    'player_id': np.int64,
+    'age': np.float32,
+    'height_cm': np.float32,
+    'weight_kg': np.float32,
+    'games_played': np.int32,
+    'goals': np.int32,
+    'assists': np.int32,
+    'points': np.int32,
+    'plus_minus': np.int32,
+    'pim': np.int32,
+    'shots': np.int32,
+    'shooting_pct': np.float32,
+    'powerplay_goals': np.int32,
+    'powerplay_points': np.int32,
+    'career_games': np.int32,
+    'career_goals': np.int32,
+    'career_assists': np.int32,
+    'career_points': np.int32,
+    'career_plus_minus': np.int32,
+    'career_pim': np.int32,
+    'career_shots': np.int32,
+    'career_shooting_pct': np.float32,
+    'career_powerplay_goals': np.int32,
+    'career_powerplay_points': np.int32,
+    'goals_per_game': np.float32,
+    'points_per_game': np.float32,
+    'shots_per_game': np.float32
+}
+
+
 class NHLDataProcessor:
     def __init__(self, json_path: str = "output.json"):
         self.json_path = json_path
@@ -22,15 +88,14 @@ class NHLDataProcessor:
         }
 
     def load_json_data(self) -> Dict[str, List[Dict]]:
-        """Load and parse the JSON data from file."""
-        try:
-            with open(self.json_path, 'r') as f:
-                content = f.read()
+        """Load and parse the JSON written by NHLStats.save_team_stats.
 
-            # Find the JSON object at the end of the file
-            split_text = "Saving complete stats to file..."
-            json_str = content.split(split_text)[-1].strip()
-            return json.loads(json_str)
+        The JSON is parsed incrementally from the file handle rather than
+        being read into a single string first.
+        """
+        try:
+            with open(self.json_path, 'rb') as f:
+                return dict(ijson.kvitems(f, '', use_float=True))
 
         except Exception as e:
             logger.error(f"Error loading JSON file: {e}")
@@ -60,14 +125,11 @@ class NHLDataProcessor:
         )
         features['name'] = f"{first_name} {last_name}".strip()
 
-        # Try to get birth date
-        try:
-            birth_date = player_data.get('birthDate', '1900-01-01')
-            year = int(birth_date.split('-')[0])
-            features['age'] = 2024 - year
-        except Exception as e:
-            logger.warning(f"Error calculating age: {e}")
-            features['age'] = None
+        # Age from the birth year, NaN if the date is missing or malformed
+        birth_year = str(player_data.get('birthDate') or '')[:4]
+        features['age'] = (
+            SEASON_YEAR - int(birth_year) if birth_year.isdigit() else np.nan
+        )
 
         # Physical attributes
         features['height_cm'] = player_data.get('heightInCentimeters')
@@ -120,45 +182,133 @@ class NHLDataProcessor:
 
         return features
 
+    def extract_features_batch(
+        self, players: List[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """Extract features for many players at once.
+
+        Produces the same columns as extract_player_features, one row
+        per player, without walking each player's dicts in Python.
+        Numeric columns are built directly with their PLAYER_DTYPES
+        type. Every player must have a playerId.
+        """
+        raw = pd.json_normalize(players, sep='_', max_level=3)
+
+        def column(name: str, default: Any = None) -> pd.Series:
+            if name in raw:
+                return raw[name]
+            return pd.Series(default, index=raw.index)
+
+        def numeric(name: str, feature: str, default: Any = None):
+            values = column(name, default)
+            if default is not None:
+                values = values.fillna(default)
+            dtype = PLAYER_DTYPES[feature]
+            # Integer columns are filled or required, so only floats can
+            # hold NaN (pandas 2.x rejects na_value for integer dtypes)
+            if np.issubdtype(dtype, np.floating):
+                return values.to_numpy(dtype=dtype, na_value=np.nan)
+            return values.to_numpy(dtype=dtype)
+
+        def name_part(key: str) -> pd.Series:
+            # Names are either {"default": ...} dicts or plain strings
+            part = column(f'{key}_default')
+            if key in raw:
+                part = part.fillna(raw[key])
+            return part.fillna('').astype(str)
+
+        # Birth years are the first four characters of each ISO date;
+        # truncating the fixed-width strings parses them all at once
+        birth_year = (
+            column('birthDate').to_numpy(dtype='U10', na_value='')
+            .astype('U4')
+        )
+        valid_year = np.char.isdigit(birth_year)
+        birth_year = np.where(valid_year, birth_year, '0').astype(np.int16)
+        age = np.where(valid_year, SEASON_YEAR - birth_year, np.nan)
+
+        df = pd.DataFrame({
+            'player_id': numeric('playerId', 'player_id'),
+            'team': column('currentTeamAbbrev'),
+            'position': column('position'),
+            'name': (name_part('firstName') + ' '
+                     + name_part('lastName')).str.strip(),
+            'age': age.astype(np.float32),
+            'height_cm': numeric('heightInCentimeters', 'height_cm'),
+            'weight_kg': numeric('weightInKilograms', 'weight_kg'),
+            **{
+                feature: numeric(SEASON_PREFIX + field, feature, 0)
+                for field, feature in SEASON_STATS.items()
+            },
+            **{
+                feature: numeric(CAREER_PREFIX + field, feature, 0)
+                for field, feature in CAREER_STATS.items()
+            }
+        })
+
+        # Calculate per-game metrics, leaving 0 where no games were played
+        games = df['games_played'].to_numpy()
+        played = games > 0
+        safe_games = np.where(played, games, 1)
+        for stat in ['goals', 'points', 'shots']:
+            per_game = np.where(played, df[stat].to_numpy() / safe_games, 0)
+            df[f'{stat}_per_game'] = per_game.astype(np.float32)
+
+        return df
+
     def create_dataset(self) -> pd.DataFrame:
         """Create a pandas DataFrame from the processed data."""
         all_data = self.load_json_data()
 
-        # Extract player data
+        # Keep the first entry for each player on one of our teams
         all_players = []
         processed_ids = set()  # To avoid duplicates
 
-        # Process each team's data
         for team_abbrev, team_data in all_data.items():
             logger.info(f"Processing {team_abbrev} data...")
             for player_data in team_data:
                 player_id = player_data.get('playerId')
-                if player_id and player_id not in processed_ids:
-                    player_features = self.extract_player_features(player_data)
-                    if player_features.get('team') in self.teams:
-                        all_players.append(player_features)
-                        processed_ids.add(player_id)
-                        name = player_features.get('name')
-                        logger.info(f"Processed player: {name}")
+                team = player_data.get('currentTeamAbbrev')
+                if (player_id and player_id not in processed_ids
+                        and team in self.teams):
+                    all_players.append(player_data)
+                    processed_ids.add(player_id)
 
         # Create DataFrame
-        df = pd.DataFrame(all_players)
+        df = self.extract_features_batch(all_players)
 
-        # Basic data cleaning
-        if not df.empty:
-            df = df.dropna(subset=['player_id', 'team'])
+        # One summary line per team rather than one line per player
+        if logger.isEnabledFor(logging.INFO):
+            for team, names in df.groupby('team')['name']:
+                logger.info(
+                    "Processed %d players for %s: %s",
+                    len(names), team, ', '.join(names)
+                )
 
         logger.info(f"Created dataset with {len(df)} players")
         return df
 
-    def save_processed_data(self, output_dir: str = "data") -> None:
-        """Save the processed data to CSV."""
+    def save_processed_data(
+        self, output_dir: str = "data", as_csv: bool = False
+    ) -> None:
+        """Save the processed data to Parquet, or CSV if requested."""
         Path(output_dir).mkdir(parents=True, exist_ok=True)
         df = self.create_dataset()
 
         if len(df) > 0:
-            output_path = Path(output_dir) / "processed_player_stats.csv"
-            df.to_csv(output_path, index=False)
+            if as_csv:
+                output_path = Path(output_dir) / "processed_player_stats.csv"
+                df.to_csv(output_path, index=False)
+            else:
+                output_path = (
+                    Path(output_dir) / "processed_player_stats.parquet"
+                )
+                df.to_parquet(
+                    output_path,
+                    engine='pyarrow',
+                    compression='zstd',
+                    index=False
+                )
             logger.info(f"Saved processed data to {output_path}")
 
             # Print some basic statistics
@@ -3,14 +3,21 @@ Example usage of the NHL ML components for player point prediction.
 """
 import pandas as pd
 from pathlib import Path
+from typing import Tuple
 import os
 
+from ..data.data_processor import PLAYER_DTYPES
 from .train_model import ModelTrainer
 from .model_evaluation import ModelEvaluator
 
 
-def prepare_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Prepare features for player point prediction."""
+def prepare_features(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Prepare features for player point prediction.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Feature and target columns, and
+            the name and position of the same players
+    """
     # Select relevant features
     feature_cols = [
         'age', 'height_cm', 'weight_kg', 'games_played',
@@ -21,11 +28,22 @@ def prepare_features(df: pd.DataFrame) -> pd.DataFrame:
         'goals_per_game', 'shots_per_game'
     ]
 
-    # Filter out goalies and players with no games played
-    df = df[df['position'] != 'G']
-    df = df[df['games_played'] > 0]
+    # Filter out goalies and players with no games played in one mask
+    mask = (
+        (df['position'].to_numpy() != 'G')
+        & (df['games_played'].to_numpy() > 0)
+    )
+
+    features = df.loc[mask, feature_cols + ['points']]
 
-    return df[feature_cols + ['points']]
+    # Narrow each feature to the smallest dtype that holds it, so frames
+    # loaded without PLAYER_DTYPES don't carry 64-bit columns into training.
+    # The target keeps its loaded width.
+    for col in feature_cols:
+        kind = 'float' if features[col].dtype.kind == 'f' else 'integer'
+        features[col] = pd.to_numeric(features[col], downcast=kind)
+
+    return features, df.loc[mask, ['name', 'position']]
 
 
 def run_example():
@@ -36,19 +54,23 @@ def run_example():
         .parents[3]
     )
 
-    # Load player data
-    data_path = workspace_root / "data/processed_player_stats.csv"
-    if not data_path.exists():
+    # Load player data, preferring the Parquet output
+    data_path = workspace_root / "data/processed_player_stats.parquet"
+    csv_path = data_path.with_suffix(".csv")
+    if data_path.exists():
+        data = pd.read_parquet(data_path)
+    elif csv_path.exists():
+        # Multithreaded Arrow parser, typed to match the Parquet output
+        data = pd.read_csv(csv_path, engine='pyarrow', dtype=PLAYER_DTYPES)
+    else:
         print(
             f"Please ensure {data_path} exists with processed player "
             "statistics"
         )
         return
 
-    data = pd.read_csv(data_path)
-
     # Prepare features
-    prepared_data = prepare_features(data)
+    prepared_data, player_info = prepare_features(data)
 
     # Initialize trainer and evaluator
     trainer = ModelTrainer(model_type='random_forest')
@@ -79,32 +101,34 @@ def run_example():
     # Load the model and make predictions
     loaded_trainer = ModelTrainer.load_model(str(model_path))
 
-    # Process new data for predictions (using a sample of players)
-    sample_players = (
-        data[data['games_played'] >= 40]
+    # Process new data for predictions (using a sample of the players
+    # that were already filtered and prepared above)
+    sample_features = (
+        prepared_data[prepared_data['games_played'] >= 40]
         .sample(n=10, random_state=42)
     )
+    sample_info = player_info.loc[sample_features.index]
     print("\nPredicting points for sample players:")
     print("-" * 40)
 
     # Prepare sample data
-    sample_features = prepare_features(sample_players)
-    processed_data = loaded_trainer.data_processor.process_new_data(
+    processed_data = loaded_trainer.data_processor.process_new_array(
         sample_features
     )
-    predictions = loaded_trainer.model.predict(processed_data)
+    predictions = loaded_trainer.predict(processed_data)
 
-    # Create comparison DataFrame
+    # Create comparison DataFrame from plain arrays, so pandas doesn't
+    # align the columns on the sample's index
+    actual = sample_features[target_col].to_numpy()
     results = pd.DataFrame({
-        'Name': sample_players['name'],
-        'Position': sample_players['position'],
-        'Actual Points': sample_players['points'],
+        'Name': sample_info['name'].to_numpy(),
+        'Position': sample_info['position'].to_numpy(),
+        'Actual Points': actual,
         'Predicted Points': predictions.round(1)
     })
     print(results.to_string(index=False))
 
     # Evaluate predictions
-    actual = sample_features[target_col].values
     eval_metrics = evaluator.evaluate_predictions(actual, predictions)
 
     print("\nEvaluation Metrics on Sample Players:")
@@ -118,15 +142,15 @@ def run_example():
 
     # Predictions plot
     fig, _ = evaluator.plot_predictions("NHL Player Point Predictions")
-    fig.savefig(plots_dir / "point_predictions.png")
+    fig.savefig(plots_dir / "point_predictions.png", dpi=120)
 
     # Feature importance plot
     fig, _ = evaluator.plot_feature_importance(importance_df)
-    fig.savefig(plots_dir / "point_feature_importance.png")
+    fig.savefig(plots_dir / "point_feature_importance.png", dpi=120)
 
     # Residuals plot
     fig, _ = evaluator.plot_residuals()
-    fig.savefig(plots_dir / "point_residuals.png")
+    fig.savefig(plots_dir / "point_residuals.png", dpi=120)
 
     print(f"\nPlots saved to {plots_dir}")
 
@@ -0,0 +1,73 @@
+"""
+Regression metrics shared by model training and evaluation.
+"""
+from typing import Dict, Optional
+import numpy as np
+
+
+def regression_metrics(
+    y_true: np.ndarray,
+    y_pred: np.ndarray
+) -> Dict[str, float]:
+    """
+    Compute regression metrics from a single residual array.
+
+    Args:
+        y_true (np.ndarray): True target values
+        y_pred (np.ndarray): Predicted target values
+
+    Returns:
+        Dict[str, float]: Dictionary containing 'mse', 'rmse', 'mae',
+            'r2' and 'explained_variance'
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    residuals = y_true - np.asarray(y_pred, dtype=np.float64)
+
+    return residual_metrics(y_true, residuals)
+
+
+def residual_metrics(
+    y_true: np.ndarray,
+    residuals: np.ndarray,
+    abs_residuals: Optional[np.ndarray] = None
+) -> Dict[str, float]:
+    """
+    Compute regression metrics from precomputed residuals.
+
+    Args:
+        y_true (np.ndarray): True target values
+        residuals (np.ndarray): y_true minus the predicted values
+        abs_residuals (Optional[np.ndarray]): Absolute residuals, if the
+            caller already has them
+
+    Returns:
+        Dict[str, float]: Same metrics as regression_metrics
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    centered = y_true - y_true.mean()
+    if abs_residuals is None:
+        abs_residuals = np.abs(residuals)
+
+    ss_res = float(np.dot(residuals, residuals))
+    ss_tot = float(np.dot(centered, centered))
+    mse = ss_res / residuals.size
+    # Residual variance from centered residuals, which stays accurate when
+    # the predictions are biased by far more than their spread
+    centered_res = residuals - residuals.mean()
+    var_res = float(np.dot(centered_res, centered_res)) / residuals.size
+
+    # Match sklearn's scores when the target is constant
+    if ss_tot:
+        r2 = 1 - ss_res / ss_tot
+        explained_variance = 1 - var_res * residuals.size / ss_tot
+    else:
+        r2 = 1.0 if ss_res == 0 else 0.0
+        explained_variance = 1.0 if var_res == 0 else 0.0
+
+    return {
+        'mse': mse,
+        'rmse': float(np.sqrt(mse)),
+        'mae': float(abs_residuals.mean()),
+        'r2': r2,
+        'explained_variance': explained_variance
+    }
@@ -3,16 +3,12 @@ Module for evaluating ML models on NHL data.
 """
 import pandas as pd
 import numpy as np
-from sklearn.metrics import (
-    mean_squared_error,
-    r2_score,
-    mean_absolute_error,
-    explained_variance_score
-)
 import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import Dict, Tuple
 
+from .metrics import residual_metrics
+
 
 class ModelEvaluator:
     def __init__(self):
@@ -20,6 +16,9 @@ class ModelEvaluator:
         self.predictions = None
         self.actual_values = None
         self.feature_importance = None
+        # Cached by evaluate_predictions for the plots and summary
+        self._residuals = None
+        self._abs = None
 
     def evaluate_predictions(
         self,
@@ -38,16 +37,13 @@ class ModelEvaluator:
         """
         self.predictions = y_pred
         self.actual_values = y_true
+        self._residuals = (
+            np.asarray(y_true, dtype=np.float64)
+            - np.asarray(y_pred, dtype=np.float64)
+        )
+        self._abs = np.abs(self._residuals)
 
-        metrics = {
-            'mse': mean_squared_error(y_true, y_pred),
-            'rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
-            'mae': mean_absolute_error(y_true, y_pred),
-            'r2': r2_score(y_true, y_pred),
-            'explained_variance': explained_variance_score(y_true, y_pred)
-        }
-
-        return metrics
+        return residual_metrics(y_true, self._residuals, self._abs)
 
     def plot_predictions(
         self, title: str = "Predicted vs Actual Values"
@@ -68,8 +64,11 @@ class ModelEvaluator:
 
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        # Create scatter plot
-        ax.scatter(self.actual_values, self.predictions, alpha=0.5)
+        # Create scatter plot, rasterized so large datasets stay cheap
+        ax.scatter(
+            self.actual_values, self.predictions,
+            alpha=0.5, s=12, rasterized=True
+        )
 
         # Add perfect prediction line
         min_val = min(self.actual_values.min(), self.predictions.min())
@@ -105,8 +104,14 @@ class ModelEvaluator:
         """
         self.feature_importance = importance_df
 
-        # Get top N features
-        top_features = importance_df.nlargest(top_n, 'importance')
+        # Get top N features, partitioning so only those N get sorted
+        importances = importance_df['importance'].to_numpy(dtype=np.float64)
+        if top_n < len(importances):
+            top_idx = np.argpartition(-importances, top_n)[:top_n]
+        else:
+            top_idx = np.arange(len(importances))
+        top_idx = top_idx[np.argsort(-importances[top_idx], kind='stable')]
+        top_features = importance_df.iloc[top_idx]
 
         fig, ax = plt.subplots(figsize=(12, 6))
 
@@ -136,12 +141,13 @@ class ModelEvaluator:
                 "No predictions available. Run evaluate_predictions first."
             )
 
-        residuals = self.actual_values - self.predictions
-
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        # Create residual plot
-        ax.scatter(self.predictions, residuals, alpha=0.5)
+        # Create residual plot, rasterized so large datasets stay cheap
+        ax.scatter(
+            self.predictions, self._residuals,
+            alpha=0.5, s=12, rasterized=True
+        )
         ax.axhline(y=0, color='r', linestyle='--')
 
         ax.set_xlabel('Predicted Values')
@@ -165,6 +171,6 @@ class ModelEvaluator:
         return pd.DataFrame({
             'actual': self.actual_values,
             'predicted': self.predictions,
-            'residual': self.actual_values - self.predictions,
-            'abs_error': np.abs(self.actual_values - self.predictions)
-        })
+            'residual': self._residuals,
+            'abs_error': self._abs
+        }, copy=False)
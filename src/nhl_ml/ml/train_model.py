@@ -4,34 +4,81 @@ Module for training ML models on NHL data.
 from typing import Dict
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.ensemble import (
+    RandomForestRegressor,
+    GradientBoostingRegressor,
+    HistGradientBoostingRegressor
+)
+from sklearn.model_selection import RandomizedSearchCV
 import joblib
 from pathlib import Path
 
-from .data_processor import MLDataProcessor
+from .data_processor import MLDataProcessor, pipeline_from_scaler
+from .metrics import regression_metrics
+
+# LZ4 decompresses far faster than zlib; fall back if it's unavailable
+try:
+    import lz4  # noqa: F401
+    MODEL_COMPRESSION = ('lz4', 3)
+except ImportError:
+    MODEL_COMPRESSION = ('zlib', 3)
+
+# Suffix of the native predictor library compiled next to a saved model
+COMPILED_SUFFIX = '.so'
+
+# Hyperparameter search space used when tuning each model type
+PARAM_DISTRIBUTIONS = {
+    'random_forest': {
+        'n_estimators': [100, 200, 500],
+        'max_depth': [6, 10, 20, None],
+        'min_samples_split': [2, 3, 4],
+        'max_features': ['sqrt', 0.5, 1.0]
+    },
+    'gradient_boosting': {
+        'n_estimators': [100, 200, 500],
+        'learning_rate': [0.03, 0.1, 0.3],
+        'max_depth': [2, 3, 5]
+    },
+    'hist_gbm': {
+        'max_iter': [100, 200, 500],
+        'learning_rate': [0.03, 0.1, 0.3],
+        'max_leaf_nodes': [15, 31, 63],
+        'min_samples_leaf': [2, 5, 10, 20]
+    }
+}
 
 
 class ModelTrainer:
-    def __init__(self, model_type: str = 'random_forest'):
+    def __init__(self, model_type: str = 'random_forest', tune: bool = False):
         """Initialize the model trainer.
 
         Args:
-            model_type (str): Type of model to train ('random_forest' or
-                'gradient_boosting')
+            model_type (str): Type of model to train ('random_forest',
+                'gradient_boosting' or 'hist_gbm')
+            tune (bool): Search PARAM_DISTRIBUTIONS for the model's
+                hyperparameters instead of using the defaults
         """
         self.model_type = model_type
+        self.tune = tune
+        self.best_params = None
         self.model = None
+        self.predictor = None
         self.data_processor = MLDataProcessor()
 
     def create_model(self) -> None:
         """Create the specified type of model with default parameters."""
         if self.model_type == 'random_forest':
+            # warm_start lets add_trees grow the forest without refitting,
+            # and the out-of-bag score replaces scoring the training set
             self.model = RandomForestRegressor(
                 n_estimators=100,
                 max_depth=None,
                 min_samples_split=2,
                 min_samples_leaf=1,
+                bootstrap=True,
+                oob_score=True,
+                warm_start=True,
+                n_jobs=-1,
                 random_state=42
             )
         elif self.model_type == 'gradient_boosting':
@@ -41,51 +88,187 @@ class ModelTrainer:
                 max_depth=3,
                 random_state=42
             )
+        elif self.model_type == 'hist_gbm':
+            # Bins features into 8-bit histograms once, so it fits much
+            # faster than GradientBoostingRegressor on tabular data. The
+            # default 20-sample leaves can't split a single-season roster,
+            # and early stopping only kicks in once there's data to spare.
+            self.model = HistGradientBoostingRegressor(
+                max_iter=200,
+                learning_rate=0.1,
+                max_bins=255,
+                min_samples_leaf=5,
+                early_stopping='auto',
+                random_state=42
+            )
         else:
             raise ValueError(
                 f"Unsupported model type: {self.model_type}"
             )
 
-    def train(self, data: pd.DataFrame, target_col: str) -> Dict[str, float]:
+        if self.tune:
+            self.model = RandomizedSearchCV(
+                self.model,
+                param_distributions=PARAM_DISTRIBUTIONS[self.model_type],
+                n_iter=20,
+                cv=3,
+                n_jobs=-1,
+                random_state=42
+            )
+
+    def train(
+        self,
+        data: pd.DataFrame,
+        target_col: str,
+        train_metrics: bool = False
+    ) -> Dict[str, float]:
         """Train the model on the provided data.
 
         Args:
             data (pd.DataFrame): Training data
             target_col (str): Name of the target column
+            train_metrics (bool): Also score the model on its own training
+                split, which costs a full extra predict pass
 
         Returns:
-            Dict[str, float]: Dictionary containing training metrics
+            Dict[str, float]: Dictionary containing test metrics, the
+                out-of-bag R² for random forests, and the train metrics
+                when requested
         """
         # Prepare the data
         X_train, X_test, y_train, y_test = (
             self.data_processor.prepare_features(data, target_col)
         )
 
-        # Create and train the model
+        # Row-major float32 matrices, so sklearn doesn't copy them again
+        X_train = np.ascontiguousarray(X_train, dtype=np.float32)
+        X_test = np.ascontiguousarray(X_test, dtype=np.float32)
+
+        # Create and train the model. sklearn's tree code releases the
+        # GIL, so threads avoid copying the training data to processes.
         self.create_model()
-        self.model.fit(X_train, y_train)
+        with joblib.parallel_backend('threading'):
+            self.model.fit(X_train, y_train)
+
+            # Keep only the best model so the saved payload stays small
+            if isinstance(self.model, RandomizedSearchCV):
+                self.best_params = self.model.best_params_
+                self.model = self.model.best_estimator_
 
-        # Make predictions
-        train_pred = self.model.predict(X_train)
-        test_pred = self.model.predict(X_test)
+            # Make predictions
+            test_pred = self.model.predict(X_test)
+            if train_metrics:
+                train_pred = self.model.predict(X_train)
 
-        # Calculate metrics
+        # Calculate metrics, one pass over each split's residuals
+        test_scores = regression_metrics(y_test, test_pred)
         metrics = {
-            'train_mse': mean_squared_error(y_train, train_pred),
-            'test_mse': mean_squared_error(y_test, test_pred),
-            'train_rmse': np.sqrt(mean_squared_error(y_train, train_pred)),
-            'test_rmse': np.sqrt(mean_squared_error(y_test, test_pred)),
-            'train_r2': r2_score(y_train, train_pred),
-            'test_r2': r2_score(y_test, test_pred)
+            'test_mse': test_scores['mse'],
+            'test_rmse': test_scores['rmse'],
+            'test_r2': test_scores['r2']
         }
 
+        # Generalization estimate computed during fit at no extra cost
+        if hasattr(self.model, 'oob_score_'):
+            metrics['oob_r2'] = self.model.oob_score_
+
+        if train_metrics:
+            train_scores = regression_metrics(y_train, train_pred)
+            metrics.update({
+                'train_mse': train_scores['mse'],
+                'train_rmse': train_scores['rmse'],
+                'train_r2': train_scores['r2']
+            })
+
         return metrics
 
-    def save_model(self, filepath: str) -> None:
+    def add_trees(
+        self, n_trees: int, data: pd.DataFrame, target_col: str
+    ) -> None:
+        """Grow the trained random forest with trees fitted on new data.
+
+        Existing trees are kept, so the cost is linear in n_trees. The data
+        is scaled with the already fitted pipeline so old and new trees see
+        the same inputs. Keep the model's random_state fixed between calls:
+        the new trees then get the same seeds a from-scratch fit would use.
+
+        The out-of-bag score is dropped: the original trees' bootstrap
+        samples can't be recovered for new data, so it would be inflated.
+
+        Args:
+            n_trees (int): Number of trees to add
+            data (pd.DataFrame): Data with the training feature columns
+            target_col (str): Name of the target column
+        """
+        if self.model is None or self.model_type != 'random_forest':
+            raise ValueError(
+                "add_trees requires a trained random_forest model."
+            )
+        if n_trees < 1:
+            raise ValueError("n_trees must be at least 1.")
+
+        X = self.data_processor.process_new_array(data)
+        y = data[target_col].to_numpy()
+
+        self.model.set_params(
+            warm_start=True,
+            oob_score=False,
+            n_estimators=self.model.n_estimators + n_trees
+        )
+        with joblib.parallel_backend('threading'):
+            self.model.fit(X, y)
+        for attr in ('oob_score_', 'oob_prediction_'):
+            if hasattr(self.model, attr):
+                delattr(self.model, attr)
+
+        # A compiled predictor no longer matches the grown forest
+        self.predictor = None
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predict with the compiled predictor if loaded, else the model.
+
+        Args:
+            X (np.ndarray): Processed feature matrix
+
+        Returns:
+            np.ndarray: Predicted values, one per row of X
+        """
+        if self.predictor is not None:
+            import tl2cgen
+
+            return self.predictor.predict(tl2cgen.DMatrix(X)).reshape(len(X))
+
+        # Older saved models were fitted on named columns
+        if hasattr(self.model, 'feature_names_in_'):
+            X = pd.DataFrame(X, columns=self.model.feature_names_in_)
+        return self.model.predict(X)
+
+    def compile_model(self, libpath: str) -> None:
+        """Compile the trained model's trees into a native library.
+
+        Requires the optional ``treelite`` and ``tl2cgen`` dependencies
+        and a C compiler.
+
+        Args:
+            libpath (str): Path of the shared library to write
+        """
+        import treelite
+        import tl2cgen
+
+        tl2cgen.export_lib(
+            treelite.sklearn.import_model(self.model),
+            toolchain='gcc',
+            libpath=str(libpath),
+            params={'parallel_comp': 8}
+        )
+
+    def save_model(self, filepath: str, native: bool = False) -> None:
         """Save the trained model to disk.
 
         Args:
             filepath (str): Path where to save the model
+            native (bool): Also compile the model into a native predictor
+                library next to the saved model
         """
         if self.model is None:
             raise ValueError("No model to save. Train a model first.")
@@ -93,14 +276,25 @@ class ModelTrainer:
         # Create directory if it doesn't exist
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
 
-        # Save the model and scaler
+        # The payload names the library, so load_model never picks up a
+        # file it didn't compile for this model
+        compiled_lib = None
+        if native:
+            libpath = Path(filepath).with_suffix(COMPILED_SUFFIX)
+            self.compile_model(libpath)
+            compiled_lib = libpath.name
+
+        # Save the model and preprocessing pipeline
         model_data = {
             'model': self.model,
-            'scaler': self.data_processor.scaler,
+            'pipeline': self.data_processor.pipeline,
             'feature_columns': self.data_processor.feature_columns,
-            'model_type': self.model_type
+            'model_type': self.model_type,
+            'compiled_lib': compiled_lib
         }
-        joblib.dump(model_data, filepath)
+        joblib.dump(
+            model_data, filepath, compress=MODEL_COMPRESSION, protocol=5
+        )
 
     @classmethod
     def load_model(cls, filepath: str) -> 'ModelTrainer':
@@ -110,17 +304,35 @@ class ModelTrainer:
             filepath (str): Path to the saved model
 
         Returns:
-            ModelTrainer: Instance with loaded model and scaler
+            ModelTrainer: Instance with loaded model and pipeline, and the
+                compiled predictor when one was saved and tl2cgen is
+                installed
         """
         model_data = joblib.load(filepath)
 
         trainer = cls(model_type=model_data['model_type'])
         trainer.model = model_data['model']
-        trainer.data_processor.scaler = model_data['scaler']
+        if 'pipeline' in model_data:
+            trainer.data_processor.pipeline = model_data['pipeline']
+        else:
+            # Saved before the preprocessing pipeline replaced the scaler
+            trainer.data_processor.pipeline = pipeline_from_scaler(
+                model_data['scaler']
+            )
         trainer.data_processor.feature_columns = (
             model_data['feature_columns']
         )
 
+        # Only use a library recorded when this model was saved
+        if model_data.get('compiled_lib'):
+            libpath = Path(filepath).parent / model_data['compiled_lib']
+            try:
+                import tl2cgen
+            except ImportError:
+                tl2cgen = None
+            if tl2cgen is not None and libpath.exists():
+                trainer.predictor = tl2cgen.Predictor(str(libpath))
+
         return trainer
 
     def get_feature_importance(self) -> pd.DataFrame:
@@ -2,8 +2,10 @@
 NHL API constants and configuration values.
 """
 
-# Team IDs
-TEAM_IDS = {
+from types import MappingProxyType
+
+# Team IDs (read-only view so callers cannot mutate the shared table)
+TEAM_IDS = MappingProxyType({
     "TOR": 10,  # Toronto Maple Leafs
     "FLA": 13,  # Florida Panthers
     "BOS": 6,   # Boston Bruins
@@ -12,7 +14,7 @@ TEAM_IDS = {
     "OTT": 9,   # Ottawa Senators
     "BUF": 7,   # Buffalo Sabres
     "DET": 17,  # Detroit Red Wings
-}
+})
 
 # API Endpoints
 API_BASE = "https://api-web.nhle.com/v1"
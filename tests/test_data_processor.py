@@ -1,11 +1,12 @@
 """Tests for the data processor module."""
 
 import json
+import numpy as np
 import pytest
 import pandas as pd
 from pathlib import Path
-from unittest.mock import patch, mock_open
-from src.nhl_ml.data.data_processor import NHLDataProcessor
+from unittest.mock import patch
+from src.nhl_ml.data.data_processor import NHLDataProcessor, PLAYER_DTYPES
 
 @pytest.fixture
 def sample_player_data():
@@ -79,26 +80,84 @@ def test_extract_player_features(processor, sample_player_data):
     assert features["career_points"] == 250
     assert features["goals_per_game"] == pytest.approx(30/82)
 
-@patch("builtins.open", new_callable=mock_open)
-def test_load_json_data(mock_file, processor, sample_player_data):
+def test_extract_features_batch(processor, sample_player_data):
+    """Test batch extraction matches per-player extraction."""
+    players = sample_player_data["TOR"]
+    df = processor.extract_features_batch(players)
+    expected = processor.extract_player_features(players[0])
+
+    assert list(df.columns) == list(expected)
+    for column, value in expected.items():
+        assert df.loc[0, column] == pytest.approx(value)
+    for column, dtype in PLAYER_DTYPES.items():
+        assert df[column].dtype == dtype
+
+def test_extract_features_batch_missing_birth_date(processor):
+    """Test that missing or malformed birth dates give a NaN age on both
+    the batch and per-player paths."""
+    players = [
+        {"playerId": 1, "birthDate": "1996-09-17"},
+        {"playerId": 2},
+        {"playerId": 3, "birthDate": "unknown"},
+    ]
+    df = processor.extract_features_batch(players)
+    ages = [processor.extract_player_features(p)["age"] for p in players]
+
+    assert df.loc[0, "age"] == ages[0] == 28
+    assert df.loc[1:, "age"].isna().all()
+    assert np.isnan(ages[1:]).all()
+
+def test_create_dataset_filters_teams_and_duplicates(
+    processor, sample_player_data
+):
+    """Test that other teams and repeated players are dropped."""
+    player = sample_player_data["TOR"][0]
+    other_team = {**player, "playerId": 1, "currentTeamAbbrev": "BOS"}
+    all_data = {"TOR": [player, other_team], "FLA": [player]}
+
+    with patch.object(processor, "load_json_data", return_value=all_data):
+        df = processor.create_dataset()
+
+    assert df["player_id"].tolist() == [8478483]
+    assert df["goals"].dtype == "int32"
+    assert df["points_per_game"].dtype == "float32"
+
+def test_load_json_data(tmp_path, sample_player_data):
     """Test JSON data loading."""
-    mock_file.return_value.read.return_value = (
-        "Some log data\n"
-        "Saving complete stats to file...\n"
-        f"{json.dumps(sample_player_data)}"
-    )
+    json_path = tmp_path / "test.json"
+    json_path.write_text(json.dumps(sample_player_data, indent=2))
     
-    data = processor.load_json_data()
+    data = NHLDataProcessor(str(json_path)).load_json_data()
     assert "TOR" in data
     assert len(data["TOR"]) == 1
     assert data["TOR"][0]["playerId"] == 8478483
+    career = data["TOR"][0]["careerTotals"]["regularSeason"]
+    assert isinstance(career["shootingPctg"], float)
+
+def test_load_json_data_invalid_file(tmp_path):
+    """Test that an unreadable file yields no data."""
+    json_path = tmp_path / "test.json"
+    json_path.write_text("Saving complete stats to file...\n{}")
+
+    assert NHLDataProcessor(str(json_path)).load_json_data() == {}
 
 @patch.object(Path, "mkdir")
-@patch("pandas.DataFrame.to_csv")
-def test_save_processed_data(mock_to_csv, mock_mkdir, processor, sample_player_data):
+@patch("pandas.DataFrame.to_parquet")
+def test_save_processed_data(mock_to_parquet, mock_mkdir, processor, sample_player_data):
     """Test saving processed data."""
     with patch.object(processor, "load_json_data", return_value=sample_player_data):
         processor.save_processed_data("test_output")
         
     mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
+    mock_to_parquet.assert_called_once()
+    output_path = mock_to_parquet.call_args.args[0]
+    assert output_path == Path("test_output") / "processed_player_stats.parquet"
+
+@patch.object(Path, "mkdir")
+@patch("pandas.DataFrame.to_csv")
+def test_save_processed_data_as_csv(mock_to_csv, mock_mkdir, processor, sample_player_data):
+    """Test saving processed data as CSV."""
+    with patch.object(processor, "load_json_data", return_value=sample_player_data):
+        processor.save_processed_data("test_output", as_csv=True)
+
     mock_to_csv.assert_called_once() 
\ No newline at end of file
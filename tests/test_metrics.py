@@ -0,0 +1,54 @@
+"""Tests for the regression metrics module."""
+
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    explained_variance_score,
+    mean_absolute_error,
+    mean_squared_error,
+    r2_score,
+)
+from src.nhl_ml.ml.metrics import regression_metrics, residual_metrics
+
+def test_regression_metrics_match_sklearn():
+    """Test that metrics agree with sklearn's implementations."""
+    rng = np.random.default_rng(42)
+    y_true = rng.normal(50, 20, size=200)
+    y_pred = y_true + rng.normal(0, 5, size=200)
+
+    metrics = regression_metrics(y_true, y_pred)
+
+    mse = mean_squared_error(y_true, y_pred)
+    assert metrics["mse"] == pytest.approx(mse)
+    assert metrics["rmse"] == pytest.approx(np.sqrt(mse))
+    assert metrics["mae"] == pytest.approx(mean_absolute_error(y_true, y_pred))
+    assert metrics["r2"] == pytest.approx(r2_score(y_true, y_pred))
+    assert metrics["explained_variance"] == pytest.approx(
+        explained_variance_score(y_true, y_pred)
+    )
+
+def test_explained_variance_with_biased_predictions():
+    """Test explained variance stays accurate when predictions are offset."""
+    rng = np.random.default_rng(0)
+    y_true = 1e6 + rng.normal(0, 100, size=500)
+    y_pred = y_true + 1e5 + rng.normal(0, 0.1, size=500)
+
+    assert regression_metrics(y_true, y_pred)["explained_variance"] == (
+        pytest.approx(explained_variance_score(y_true, y_pred), abs=1e-12)
+    )
+
+def test_regression_metrics_constant_target():
+    """Test R² for a constant target follows sklearn."""
+    assert regression_metrics([3, 3], [3, 3])["r2"] == 1.0
+    assert regression_metrics([3, 3], [3, 4])["r2"] == 0.0
+    assert regression_metrics([3, 3], [4, 4])["explained_variance"] == 1.0
+
+def test_residual_metrics_match_regression_metrics():
+    """Test that precomputed residuals give the same metrics."""
+    y_true = np.array([10.0, 20.0, 30.0, 40.0])
+    y_pred = np.array([12.0, 18.0, 33.0, 39.0])
+    residuals = y_true - y_pred
+
+    assert residual_metrics(y_true, residuals, np.abs(residuals)) == (
+        pytest.approx(regression_metrics(y_true, y_pred))
+    )
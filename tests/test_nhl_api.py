@@ -1,9 +1,13 @@
 """Tests for the NHL API module."""
 
+import asyncio
 import json
 import pytest
+import requests
+from functools import partial
 from unittest.mock import patch, Mock
 from src.nhl_ml.api.nhl_api import NHLStats, NHL_API_BASE
+from src.nhl_ml.api.session import REQUEST_TIMEOUT
 
 @pytest.fixture
 def nhl_stats():
@@ -46,8 +50,17 @@ def test_init(nhl_stats):
     assert nhl_stats.headers == {'Accept': 'application/json'}
     assert "TOR" in nhl_stats.teams
     assert "FLA" in nhl_stats.teams
+    assert nhl_stats.session.headers["Accept"] == "application/json"
 
-@patch('requests.get')
+@patch('requests.Session.close')
+def test_context_manager_closes_session(mock_close):
+    """Test that the session is closed when leaving the context."""
+    with NHLStats() as nhl:
+        assert isinstance(nhl, NHLStats)
+
+    mock_close.assert_called_once()
+
+@patch('requests.Session.get')
 def test_get_team_roster(mock_get, nhl_stats):
     """Test getting team roster."""
     mock_response = Mock()
@@ -66,10 +79,23 @@ def test_get_team_roster(mock_get, nhl_stats):
     assert roster[2]["id"] == 3
     mock_get.assert_called_once_with(
         f"{NHL_API_BASE}/roster/TOR/current",
-        headers=nhl_stats.headers
+        timeout=REQUEST_TIMEOUT
     )
 
-@patch('requests.get')
+@patch('requests.Session.get')
+def test_get_team_roster_is_memoized(mock_get, nhl_stats):
+    """Test that repeated roster lookups reuse the decoded response."""
+    mock_response = Mock()
+    mock_response.json.return_value = {"forwards": [{"id": 1}]}
+    mock_get.return_value = mock_response
+
+    first = nhl_stats.get_team_roster("TOR")
+    second = nhl_stats.get_team_roster("TOR")
+
+    assert first == second == [{"id": 1}]
+    mock_get.assert_called_once()
+
+@patch('requests.Session.get')
 def test_get_player_stats(mock_get, nhl_stats, mock_player_response):
     """Test getting player stats."""
     mock_response = Mock()
@@ -83,8 +109,55 @@ def test_get_player_stats(mock_get, nhl_stats, mock_player_response):
     assert stats["firstName"]["default"] == "John"
     mock_get.assert_called_once_with(
         f"{NHL_API_BASE}/player/{player_id}/landing",
-        headers=nhl_stats.headers
+        timeout=REQUEST_TIMEOUT
+    )
+
+def test_init_with_cache(tmp_path):
+    """Test that a cache name switches to a cached session."""
+    requests_cache = pytest.importorskip("requests_cache")
+
+    with NHLStats(cache_name=str(tmp_path / "nhl_cache")) as nhl:
+        assert isinstance(nhl.session, requests_cache.CachedSession)
+        assert nhl.session.settings.stale_if_error
+        assert nhl.session.headers["Accept"] == "application/json"
+
+def test_init_with_cache_without_requests_cache(tmp_path):
+    """Test that a missing requests-cache falls back to a plain session."""
+    with patch.dict("sys.modules", {"requests_cache": None}):
+        with NHLStats(cache_name=str(tmp_path / "nhl_cache")) as nhl:
+            assert type(nhl.session) is requests.Session
+
+@patch.object(NHLStats, 'get_player_stats')
+@patch.object(NHLStats, 'get_team_roster')
+def test_get_all_team_stats(mock_roster, mock_player_stats):
+    """Test fetching stats for every rostered player."""
+    mock_roster.return_value = [{"id": 1}, {"id": 2}, {"name": "No ID"}]
+    mock_player_stats.side_effect = lambda pid: {"playerId": pid}
+
+    with NHLStats(max_workers=2) as nhl:
+        all_stats = nhl.get_all_team_stats()
+
+    assert list(all_stats) == ["TOR", "FLA"]
+    assert all_stats["TOR"] == [{"playerId": 1}, {"playerId": 2}]
+    assert mock_player_stats.call_count == 4
+
+def test_get_all_team_stats_async(nhl_stats, mock_player_response):
+    """Test fetching all team stats through the async client."""
+    httpx = pytest.importorskip("httpx")
+
+    def handler(request):
+        if request.url.path.startswith("/v1/roster/"):
+            return httpx.Response(200, json={"forwards": [{"id": 8478483}]})
+        return httpx.Response(200, json=mock_player_response)
+
+    client = partial(
+        httpx.AsyncClient, transport=httpx.MockTransport(handler)
     )
+    with patch("httpx.AsyncClient", client):
+        all_stats = asyncio.run(nhl_stats.get_all_team_stats_async())
+
+    assert list(all_stats) == ["TOR", "FLA"]
+    assert all_stats["TOR"][0]["playerId"] == 8478483
 
 @patch('builtins.open', create=True)
 @patch.object(NHLStats, 'get_all_team_stats')
@@ -98,5 +171,19 @@ def test_save_team_stats(mock_get_stats, mock_open, nhl_stats):
     
     nhl_stats.save_team_stats("test.json")
     
-    mock_file.write.assert_called_once_with(json.dumps(test_data, indent=2))
-    mock_open.assert_called_once_with("test.json", "w") 
\ No newline at end of file
+    mock_file.write.assert_called_once_with(
+        json.dumps(test_data, indent=2).encode()
+    )
+    mock_open.assert_called_once_with("test.json", "wb") 
+
+@patch.object(NHLStats, 'get_all_team_stats')
+def test_save_team_stats_non_ascii(mock_get_stats, tmp_path, nhl_stats):
+    """Test that saved stats decode to the same data, with UTF-8 names."""
+    test_data = {"SEA": [{"name": "Järnkrok", "shootingPctg": 1e-07}]}
+    mock_get_stats.return_value = test_data
+    output_file = tmp_path / "output.json"
+
+    nhl_stats.save_team_stats(str(output_file))
+
+    assert "Järnkrok".encode() in output_file.read_bytes()
+    assert json.loads(output_file.read_bytes()) == test_data
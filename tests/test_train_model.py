@@ -0,0 +1,177 @@
+"""Tests for the model training module."""
+
+import joblib
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock, patch
+from sklearn.ensemble import (
+    HistGradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.preprocessing import StandardScaler
+from src.nhl_ml.ml.train_model import PARAM_DISTRIBUTIONS, ModelTrainer
+
+@pytest.fixture
+def training_data():
+    """Fixture for a small synthetic regression dataset."""
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(
+        rng.random((120, 4)), columns=["shots", "games", "age", "pim"]
+    )
+    df["points"] = 50 * df["shots"] + 20 * df["games"]
+    return df
+
+@pytest.fixture
+def trained_trainer(training_data):
+    """Fixture for a random forest trainer fitted on the training data."""
+    trainer = ModelTrainer()
+    trainer.train(training_data, "points")
+    return trainer
+
+def test_load_model_with_legacy_scaler(tmp_path, trained_trainer, training_data):
+    """Test loading a model saved with a bare scaler instead of a pipeline."""
+    scaler = trained_trainer.data_processor.pipeline.named_steps["scaler"]
+    path = tmp_path / "legacy.joblib"
+    joblib.dump({
+        "model": trained_trainer.model,
+        "scaler": scaler,
+        "feature_columns": trained_trainer.data_processor.feature_columns,
+        "model_type": "random_forest",
+    }, path)
+
+    loaded = ModelTrainer.load_model(str(path))
+    features = training_data.drop(columns="points")
+    X = loaded.data_processor.process_new_array(features)
+
+    np.testing.assert_allclose(
+        X, trained_trainer.data_processor.process_new_array(features),
+        rtol=1e-5, atol=1e-5
+    )
+
+    features.loc[0, "age"] = np.nan
+    X = loaded.data_processor.process_new_array(features)
+    assert X[0, 2] == 0  # Missing values take the scaled training mean
+
+def test_legacy_model_predicts_without_feature_name_warnings(
+    tmp_path, training_data
+):
+    """Test that models fitted on DataFrames don't warn on predict."""
+    features = training_data.drop(columns="points")
+    scaler = StandardScaler().fit(features)
+    model = RandomForestRegressor(n_estimators=10, random_state=42).fit(
+        pd.DataFrame(scaler.transform(features), columns=features.columns),
+        training_data["points"]
+    )
+    path = tmp_path / "legacy.joblib"
+    joblib.dump({
+        "model": model,
+        "scaler": scaler,
+        "feature_columns": list(features.columns),
+        "model_type": "random_forest",
+    }, path)
+
+    loaded = ModelTrainer.load_model(str(path))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        predictions = loaded.predict(
+            loaded.data_processor.process_new_array(features)
+        )
+
+    assert predictions.shape == (len(features),)
+
+def test_hist_gbm_fits_small_dataset(training_data):
+    """Test that hist_gbm doesn't predict a constant on a roster-sized set."""
+    trainer = ModelTrainer(model_type="hist_gbm")
+    metrics = trainer.train(training_data.head(60), "points")
+
+    assert metrics["test_r2"] > 0.5
+
+def test_train_with_tuning_keeps_best_estimator(training_data):
+    """Test that tuning replaces the search with its best model."""
+    trainer = ModelTrainer(model_type="hist_gbm", tune=True)
+    trainer.train(training_data, "points")
+
+    assert isinstance(trainer.model, HistGradientBoostingRegressor)
+    assert set(trainer.best_params) == set(PARAM_DISTRIBUTIONS["hist_gbm"])
+    params = trainer.model.get_params()
+    for name, value in trainer.best_params.items():
+        assert params[name] == value
+
+def test_add_trees_grows_forest_and_drops_oob(trained_trainer, training_data):
+    """Test that add_trees keeps the old trees and discards the OOB score."""
+    old_trees = list(trained_trainer.model.estimators_)
+    assert hasattr(trained_trainer.model, "oob_score_")
+
+    trained_trainer.add_trees(20, training_data, "points")
+
+    assert len(trained_trainer.model.estimators_) == len(old_trees) + 20
+    assert trained_trainer.model.estimators_[:len(old_trees)] == old_trees
+    assert not hasattr(trained_trainer.model, "oob_score_")
+    assert not hasattr(trained_trainer.model, "oob_prediction_")
+
+def test_add_trees_requires_trained_forest(trained_trainer, training_data):
+    """Test that add_trees rejects untrained and invalid requests."""
+    with pytest.raises(ValueError):
+        ModelTrainer().add_trees(10, training_data, "points")
+    with pytest.raises(ValueError):
+        trained_trainer.add_trees(0, training_data, "points")
+
+@pytest.fixture
+def mock_compiler():
+    """Fixture replacing treelite and tl2cgen with mocks."""
+    treelite, tl2cgen = Mock(), Mock()
+    with patch.dict("sys.modules", {"treelite": treelite, "tl2cgen": tl2cgen}):
+        yield treelite, tl2cgen
+
+def test_save_model_native_compiles_library(
+    tmp_path, trained_trainer, mock_compiler
+):
+    """Test that native=True compiles the model and records the library."""
+    treelite, tl2cgen = mock_compiler
+    path = tmp_path / "model.joblib"
+
+    trained_trainer.save_model(str(path), native=True)
+
+    treelite.sklearn.import_model.assert_called_once_with(
+        trained_trainer.model
+    )
+    assert tl2cgen.export_lib.call_args.kwargs["libpath"] == str(
+        tmp_path / "model.so"
+    )
+    assert joblib.load(path)["compiled_lib"] == "model.so"
+
+def test_load_model_uses_recorded_library(
+    tmp_path, trained_trainer, training_data, mock_compiler
+):
+    """Test that a recorded library is loaded and used for predict."""
+    _, tl2cgen = mock_compiler
+    path = tmp_path / "model.joblib"
+    trained_trainer.save_model(str(path), native=True)
+    (tmp_path / "model.so").touch()
+
+    loaded = ModelTrainer.load_model(str(path))
+    X = loaded.data_processor.process_new_array(training_data)
+    tl2cgen.Predictor.return_value.predict.return_value = np.ones(
+        (len(X), 1, 1)
+    )
+
+    tl2cgen.Predictor.assert_called_once_with(str(tmp_path / "model.so"))
+    np.testing.assert_array_equal(loaded.predict(X), np.ones(len(X)))
+
+def test_save_model_leaves_unrelated_library(
+    tmp_path, trained_trainer, training_data, mock_compiler
+):
+    """Test that an unrecorded library is neither deleted nor loaded."""
+    _, tl2cgen = mock_compiler
+    path = tmp_path / "model.joblib"
+    (tmp_path / "model.so").touch()
+
+    trained_trainer.save_model(str(path))
+    loaded = ModelTrainer.load_model(str(path))
+
+    assert (tmp_path / "model.so").exists()
+    tl2cgen.Predictor.assert_not_called()
+    X = loaded.data_processor.process_new_array(training_data)
+    np.testing.assert_allclose(loaded.predict(X), loaded.model.predict(X))